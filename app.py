@@ -31,12 +31,20 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
+from selenium.common.exceptions import (
+    TimeoutException,
+    StaleElementReferenceException,
+    InvalidSessionIdException,
+    WebDriverException,
+)
 from webdriver_manager.chrome import ChromeDriverManager
 from bs4 import BeautifulSoup
 import logging
 from datetime import datetime
 import random
 import re
+from collections import deque
+from urllib.parse import urlparse
 
 # Configure logging
 logging.basicConfig(
@@ -48,11 +56,167 @@ logging.basicConfig(
     ]
 )
 
+# Retry / circuit breaker settings
+RETRY_MAX_ATTEMPTS = 4
+RETRY_BASE_DELAY = 2.0        # seconds, doubled on every attempt
+RETRY_MAX_DELAY = 60.0        # cap for a single backoff sleep
+BREAKER_WINDOW = 10           # number of recent requests tracked per host
+BREAKER_MIN_SAMPLES = 5       # requests needed before the failure rate counts
+BREAKER_FAILURE_RATE = 0.5    # open the circuit at or above this rate
+BREAKER_COOLDOWN = 60.0       # seconds to pause once the circuit opens
+BREAKER_MAX_COOLDOWN = 900.0  # cap for repeated cooldowns
+BREAKER_MAX_TRIPS = 3         # consecutive trips without a success before giving up
+
+# Error classes used by the retry layer
+ERROR_TIMEOUT = 'timeout'
+ERROR_STALE = 'stale_element'
+ERROR_THROTTLE = 'throttle'
+ERROR_AUTHWALL = 'authwall'
+ERROR_DRIVER_CRASH = 'driver_crash'
+
+# Markers for LinkedIn rate limiting, logged out sessions and security checkpoints
+THROTTLE_URL_MARKERS = ['too-many-requests']
+THROTTLE_TITLE_MARKERS = ['429', 'too many requests']
+AUTHWALL_URL_MARKERS = ['/authwall']
+CHECKPOINT_URL_MARKERS = ['/checkpoint/']
+CHECKPOINT_TITLE_MARKERS = ['security verification']
+
+# Fragments of WebDriverException messages that mean the browser is gone
+DRIVER_CRASH_MARKERS = [
+    'invalid session id',
+    'chrome not reachable',
+    'session deleted',
+    'disconnected',
+    'no such window',
+    'target window already closed',
+]
+
+
+class ThrottleDetected(Exception):
+    """Raised when LinkedIn serves a rate limit (429) page"""
+
+
+class AuthWallDetected(Exception):
+    """Raised when LinkedIn redirects to the authwall because the session is logged out"""
+
+
+class ScraperHalted(Exception):
+    """Raised when scraping cannot continue and the run should stop with partial results"""
+
+
+def classify_error(error):
+    """Map an exception to a retryable error class, or None if it should not be retried"""
+    if isinstance(error, ThrottleDetected):
+        return ERROR_THROTTLE
+    if isinstance(error, AuthWallDetected):
+        return ERROR_AUTHWALL
+    if isinstance(error, TimeoutException):
+        return ERROR_TIMEOUT
+    if isinstance(error, StaleElementReferenceException):
+        return ERROR_STALE
+    if isinstance(error, InvalidSessionIdException):
+        return ERROR_DRIVER_CRASH
+    if isinstance(error, WebDriverException):
+        message = str(error).lower()
+        if any(marker in message for marker in DRIVER_CRASH_MARKERS):
+            return ERROR_DRIVER_CRASH
+        if 'timed out' in message or 'timeout' in message:
+            return ERROR_TIMEOUT
+    return None
+
+
+def backoff_delay(attempt, base_delay=RETRY_BASE_DELAY, max_delay=RETRY_MAX_DELAY):
+    """Capped exponential backoff with full jitter for the given attempt (starting at 1)"""
+    ceiling = min(max_delay, base_delay * (2 ** (attempt - 1)))
+    return random.uniform(0, ceiling)
+
+
+class CircuitBreaker:
+    """Tracks recent request outcomes for one host and pauses requests when failures spike"""
+
+    def __init__(self, host, window=BREAKER_WINDOW, min_samples=BREAKER_MIN_SAMPLES,
+                 failure_rate=BREAKER_FAILURE_RATE, cooldown=BREAKER_COOLDOWN,
+                 max_cooldown=BREAKER_MAX_COOLDOWN, max_trips=BREAKER_MAX_TRIPS):
+        self.host = host
+        self.min_samples = min_samples
+        self.failure_rate = failure_rate
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.max_trips = max_trips
+        self.cooldown = cooldown
+        self.outcomes = deque(maxlen=window)
+        self.open_until = None
+        self.half_open = False
+        self.consecutive_trips = 0
+
+    def is_open(self):
+        """Whether the circuit is currently open"""
+        return self.open_until is not None
+
+    def current_failure_rate(self):
+        """Failure rate over the tracked window"""
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+    def wait_if_open(self):
+        """Block until the circuit allows another request"""
+        if self.open_until is None:
+            return
+        if self.consecutive_trips >= self.max_trips:
+            raise ScraperHalted(
+                f"Circuit for {self.host} opened {self.consecutive_trips} times in a row, giving up"
+            )
+        remaining = self.open_until - time.monotonic()
+        if remaining > 0:
+            logging.warning(f"Circuit open for {self.host}, pausing for {remaining:.0f}s")
+            time.sleep(remaining)
+        # Let a single trial request through
+        self.open_until = None
+        self.half_open = True
+
+    def record_success(self):
+        """Record a successful request"""
+        self.outcomes.append(True)
+        self.consecutive_trips = 0
+        if self.half_open:
+            logging.info(f"Circuit closed for {self.host}")
+            self.half_open = False
+            self.cooldown = self.base_cooldown
+            self.outcomes.clear()
+
+    def record_failure(self):
+        """Record a failed request and open the circuit if needed"""
+        self.outcomes.append(False)
+        if self.is_open():
+            # fetch_with_retry already tripped the breaker for a rate limit page on the last attempt
+            return
+        if self.half_open:
+            self.trip("trial request failed")
+        elif (len(self.outcomes) >= self.min_samples
+              and self.current_failure_rate() >= self.failure_rate):
+            self.trip(f"failure rate {self.current_failure_rate():.0%}")
+
+    def trip(self, reason):
+        """Open the circuit for the current cooldown"""
+        if self.half_open:
+            # Trial request failed, back off harder
+            self.cooldown = min(self.max_cooldown, self.cooldown * 2)
+        self.half_open = False
+        self.consecutive_trips += 1
+        self.open_until = time.monotonic() + self.cooldown
+        logging.warning(
+            f"Circuit opened for {self.host} ({reason}), cooling down for {self.cooldown:.0f}s"
+        )
+
+
 class LinkedInScraper:
     def __init__(self):
         self.driver = None
         self.wait = None
         self.scraped_data = []
+        self.credentials = None
+        self.breakers = {}
         
     def setup_driver(self):
         """Setup Chrome driver with appropriate options"""
@@ -150,6 +314,7 @@ class LinkedInScraper:
             # Check if login was successful
             if "feed" in self.driver.current_url or "linkedin.com/in/" in self.driver.current_url:
                 logging.info("Login successful")
+                self.credentials = (username, password)
                 return True
             else:
                 logging.error("Login failed - please check credentials")
@@ -159,6 +324,102 @@ class LinkedInScraper:
             logging.error(f"Error during login: {str(e)}")
             return False
     
+    def get_breaker(self, url):
+        """Return the circuit breaker for the host of the given URL"""
+        host = urlparse(url).netloc or 'default'
+        if host not in self.breakers:
+            self.breakers[host] = CircuitBreaker(host)
+        return self.breakers[host]
+    
+    def check_page_state(self):
+        """Raise if the current page is a rate limit, authwall or security checkpoint page"""
+        current_url = self.driver.current_url.lower()
+        title = (self.driver.title or '').lower()
+        
+        if any(marker in current_url for marker in CHECKPOINT_URL_MARKERS) or \
+                any(marker in title for marker in CHECKPOINT_TITLE_MARKERS):
+            # A checkpoint needs a human to verify the account, waiting will not clear it
+            raise ScraperHalted(f"Security checkpoint at {self.driver.current_url}, manual verification required")
+        
+        if any(marker in current_url for marker in AUTHWALL_URL_MARKERS):
+            raise AuthWallDetected(f"Session logged out, authwall at {self.driver.current_url}")
+        
+        if any(marker in current_url for marker in THROTTLE_URL_MARKERS) or \
+                any(marker in title for marker in THROTTLE_TITLE_MARKERS):
+            raise ThrottleDetected(f"Rate limit page detected at {self.driver.current_url}")
+    
+    def relogin(self):
+        """Log back in with the stored credentials"""
+        if not self.credentials:
+            raise ScraperHalted("Session logged out and no credentials stored to log back in")
+        
+        logging.warning("Logging back in to LinkedIn")
+        if not self.login_to_linkedin(*self.credentials):
+            raise ScraperHalted("Login failed while restoring session")
+    
+    def recover_driver(self):
+        """Restart the browser after a crash and log back in"""
+        logging.warning("Restarting Chrome driver after crash")
+        try:
+            if self.driver:
+                self.driver.quit()
+        except Exception:
+            pass
+        
+        try:
+            self.setup_driver()
+        except Exception as e:
+            raise ScraperHalted(f"Could not restart Chrome driver: {str(e)}")
+        
+        self.relogin()
+    
+    def fetch_with_retry(self, url, operation, description):
+        """Run operation() for url with classified retries, backoff and a per-host circuit breaker"""
+        breaker = self.get_breaker(url)
+        
+        for attempt in range(1, RETRY_MAX_ATTEMPTS + 1):
+            breaker.wait_if_open()
+            try:
+                result = operation()
+                breaker.record_success()
+                return result
+                
+            except Exception as e:
+                error_class = classify_error(e)
+                if error_class is None:
+                    # Not a transient failure, retrying will not help
+                    raise
+                
+                if error_class == ERROR_THROTTLE:
+                    logging.warning(f"Rate limited while {description} (attempt {attempt}/{RETRY_MAX_ATTEMPTS})")
+                    breaker.trip("rate limit page")
+                
+                if attempt == RETRY_MAX_ATTEMPTS:
+                    # Only the final outcome of a request counts towards the failure rate
+                    breaker.record_failure()
+                    logging.error(f"Giving up on {description} after {attempt} attempts ({error_class})")
+                    raise
+                
+                if error_class == ERROR_THROTTLE:
+                    # The breaker cooldown replaces the backoff sleep
+                    continue
+                
+                if error_class == ERROR_AUTHWALL:
+                    logging.warning(f"Session logged out while {description} (attempt {attempt}/{RETRY_MAX_ATTEMPTS})")
+                    self.relogin()
+                    continue
+                
+                delay = backoff_delay(attempt)
+                logging.warning(
+                    f"{error_class} while {description} (attempt {attempt}/{RETRY_MAX_ATTEMPTS}), "
+                    f"retrying in {delay:.1f}s"
+                )
+                
+                if error_class == ERROR_DRIVER_CRASH:
+                    self.recover_driver()
+                
+                time.sleep(delay)
+    
     def search_profiles(self, search_phrase):
         """Search for profiles based on search phrase"""
         try:
@@ -166,20 +427,27 @@ class LinkedInScraper:
             
             # Navigate to LinkedIn search
             search_url = f"https://www.linkedin.com/search/results/people/?keywords={search_phrase.replace(' ', '%20')}"
-            self.driver.get(search_url)
-            
-            # Wait for results to load
-            time.sleep(3)
             
-            # Scroll to load more results
-            self.scroll_page()
+            def load_results():
+                self.driver.get(search_url)
+                
+                # Wait for results to load
+                time.sleep(3)
+                self.check_page_state()
+                
+                # Scroll to load more results
+                self.scroll_page()
+                
+                # Get profile links
+                return self.extract_profile_links()
             
-            # Get profile links
-            profile_links = self.extract_profile_links()
+            profile_links = self.fetch_with_retry(search_url, load_results, f"searching '{search_phrase}'")
             logging.info(f"Found {len(profile_links)} profiles for '{search_phrase}'")
             
             return profile_links
             
+        except ScraperHalted:
+            raise
         except Exception as e:
             logging.error(f"Error searching profiles for '{search_phrase}': {str(e)}")
             return []
@@ -192,6 +460,8 @@ class LinkedInScraper:
                 time.sleep(2)
                 
         except Exception as e:
+            if classify_error(e) is not None:
+                raise
             logging.error(f"Error scrolling page: {str(e)}")
     
     def extract_profile_links(self):
@@ -216,6 +486,8 @@ class LinkedInScraper:
             return profile_links
             
         except Exception as e:
+            if classify_error(e) is not None:
+                raise
             logging.error(f"Error extracting profile links: {str(e)}")
             return []
     
@@ -224,24 +496,30 @@ class LinkedInScraper:
         try:
             logging.info(f"Scraping profile: {profile_url}")
             
-            self.driver.get(profile_url)
-            time.sleep(random.uniform(2, 4))  # Random delay to avoid detection
-            
-            # Wait for page to load
-            self.wait.until(EC.presence_of_element_located((By.TAG_NAME, "main")))
+            def load_profile():
+                self.driver.get(profile_url)
+                time.sleep(random.uniform(2, 4))  # Random delay to avoid detection
+                self.check_page_state()
+                
+                # Wait for page to load
+                self.wait.until(EC.presence_of_element_located((By.TAG_NAME, "main")))
+                
+                # Extract profile information
+                return {
+                    'name': self.extract_name(),
+                    'designation': self.extract_designation(),
+                    'company': self.extract_company(),
+                    'email': self.extract_email(),
+                    'profile_url': profile_url
+                }
             
-            # Extract profile information
-            profile_data = {
-                'name': self.extract_name(),
-                'designation': self.extract_designation(),
-                'company': self.extract_company(),
-                'email': self.extract_email(),
-                'profile_url': profile_url
-            }
+            profile_data = self.fetch_with_retry(profile_url, load_profile, f"scraping {profile_url}")
             
             logging.info(f"Scraped: {profile_data['name']} - {profile_data['designation']}")
             return profile_data
             
+        except ScraperHalted:
+            raise
         except Exception as e:
             logging.error(f"Error scraping profile {profile_url}: {str(e)}")
             return None
@@ -260,12 +538,16 @@ class LinkedInScraper:
                 try:
                     name_element = self.driver.find_element(By.CSS_SELECTOR, selector)
                     return name_element.text.strip()
-                except:
+                except Exception as e:
+                    if classify_error(e) is not None:
+                        raise
                     continue
                     
             return "N/A"
             
         except Exception as e:
+            if classify_error(e) is not None:
+                raise
             logging.error(f"Error extracting name: {str(e)}")
             return "N/A"
     
@@ -285,12 +567,16 @@ class LinkedInScraper:
                         text = element.text.strip()
                         if text and not any(word in text.lower() for word in ['connections', 'followers', 'mutual']):
                             return text
-                except:
+                except Exception as e:
+                    if classify_error(e) is not None:
+                        raise
                     continue
                     
             return "N/A"
             
         except Exception as e:
+            if classify_error(e) is not None:
+                raise
             logging.error(f"Error extracting designation: {str(e)}")
             return "N/A"
     
@@ -309,7 +595,9 @@ class LinkedInScraper:
                     elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
                     if elements:
                         return elements[0].text.strip()
-                except:
+                except Exception as e:
+                    if classify_error(e) is not None:
+                        raise
                     continue
             
             # Alternative: look for company in about section
@@ -319,12 +607,15 @@ class LinkedInScraper:
                     text = element.text.strip()
                     if 'company' in text.lower() or 'organization' in text.lower():
                         return text
-            except:
-                pass
+            except Exception as e:
+                if classify_error(e) is not None:
+                    raise
                 
             return "N/A"
             
         except Exception as e:
+            if classify_error(e) is not None:
+                raise
             logging.error(f"Error extracting company: {str(e)}")
             return "N/A"
     
@@ -347,7 +638,9 @@ class LinkedInScraper:
                             email = href.replace('mailto:', '')
                             if '@' in email:
                                 return email
-                except:
+                except Exception as e:
+                    if classify_error(e) is not None:
+                        raise
                     continue
             
             # Look for email patterns in page source
@@ -361,6 +654,8 @@ class LinkedInScraper:
             return "N/A"
             
         except Exception as e:
+            if classify_error(e) is not None:
+                raise
             logging.error(f"Error extracting email: {str(e)}")
             return "N/A"
     
@@ -402,21 +697,26 @@ class LinkedInScraper:
                 raise Exception("Login failed")
             
             # Process each search phrase
-            for phrase in search_phrases:
-                profile_links = self.search_profiles(phrase)
-                
-                # Scrape each profile
-                for profile_url in profile_links:
-                    profile_data = self.scrape_profile(profile_url)
-                    if profile_data:
-                        profile_data['search_phrase'] = phrase
-                        self.scraped_data.append(profile_data)
+            try:
+                for phrase in search_phrases:
+                    profile_links = self.search_profiles(phrase)
                     
-                    # Add delay between profiles
-                    time.sleep(random.uniform(3, 6))
-                
-                # Add delay between search phrases
-                time.sleep(random.uniform(5, 10))
+                    # Scrape each profile
+                    for profile_url in profile_links:
+                        profile_data = self.scrape_profile(profile_url)
+                        if profile_data:
+                            profile_data['search_phrase'] = phrase
+                            self.scraped_data.append(profile_data)
+                        
+                        # Add delay between profiles
+                        time.sleep(random.uniform(3, 6))
+                    
+                    # Add delay between search phrases
+                    time.sleep(random.uniform(5, 10))
+                    
+            except ScraperHalted as e:
+                # Keep whatever was collected before the run had to stop
+                logging.error(f"Scraping halted: {str(e)}")
             
             # Save results to Excel
             self.save_to_excel()
@@ -428,8 +728,11 @@ class LinkedInScraper:
             raise
         finally:
             if self.driver:
-                self.driver.quit()
-                logging.info("Driver closed")
+                try:
+                    self.driver.quit()
+                    logging.info("Driver closed")
+                except Exception as e:
+                    logging.error(f"Error closing driver: {str(e)}")
 
 def main():
     """Main entry point"""
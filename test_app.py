@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Tests for the retry layer in app.py
+===================================
+
+Covers error classification, backoff and the per-host circuit breaker.
+Selenium and the other scraper dependencies are stubbed when they are not
+installed so these checks run without a browser.
+
+Usage:
+    python -m unittest test_app
+"""
+
+import os
+import sys
+import tempfile
+import types
+import unittest
+from unittest import mock
+
+
+def stub_missing_dependencies():
+    """Insert stand-in modules for scraper dependencies that are not installed"""
+    try:
+        import selenium.common.exceptions  # noqa: F401
+    except ImportError:
+        exceptions = types.ModuleType('selenium.common.exceptions')
+
+        class WebDriverException(Exception):
+            pass
+
+        class TimeoutException(WebDriverException):
+            pass
+
+        class StaleElementReferenceException(WebDriverException):
+            pass
+
+        class InvalidSessionIdException(WebDriverException):
+            pass
+
+        exceptions.WebDriverException = WebDriverException
+        exceptions.TimeoutException = TimeoutException
+        exceptions.StaleElementReferenceException = StaleElementReferenceException
+        exceptions.InvalidSessionIdException = InvalidSessionIdException
+
+        for name in ['selenium', 'selenium.webdriver', 'selenium.webdriver.common',
+                     'selenium.webdriver.common.by', 'selenium.webdriver.support',
+                     'selenium.webdriver.support.ui', 'selenium.webdriver.support.expected_conditions',
+                     'selenium.webdriver.chrome', 'selenium.webdriver.chrome.service',
+                     'selenium.webdriver.chrome.options', 'selenium.common']:
+            sys.modules[name] = mock.MagicMock()
+        sys.modules['selenium.common.exceptions'] = exceptions
+
+    for name in ['pandas', 'bs4', 'webdriver_manager', 'webdriver_manager.chrome']:
+        try:
+            __import__(name)
+        except ImportError:
+            sys.modules[name] = mock.MagicMock()
+
+
+def import_app():
+    """Import app without leaving its log file in the working directory"""
+    stub_missing_dependencies()
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            import app
+        finally:
+            os.chdir(cwd)
+    return app
+
+
+app = import_app()
+from selenium.common.exceptions import (  # noqa: E402
+    TimeoutException,
+    StaleElementReferenceException,
+    InvalidSessionIdException,
+    WebDriverException,
+)
+
+
+class FakeClock:
+    """Replaces time.monotonic and time.sleep so cooldowns pass instantly"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class ClassifyErrorTest(unittest.TestCase):
+    def test_transient_errors(self):
+        self.assertEqual(app.classify_error(TimeoutException()), app.ERROR_TIMEOUT)
+        self.assertEqual(app.classify_error(StaleElementReferenceException()), app.ERROR_STALE)
+        self.assertEqual(app.classify_error(InvalidSessionIdException()), app.ERROR_DRIVER_CRASH)
+        self.assertEqual(app.classify_error(WebDriverException("chrome not reachable")), app.ERROR_DRIVER_CRASH)
+        self.assertEqual(app.classify_error(app.ThrottleDetected()), app.ERROR_THROTTLE)
+        self.assertEqual(app.classify_error(app.AuthWallDetected()), app.ERROR_AUTHWALL)
+
+    def test_non_transient_errors(self):
+        self.assertIsNone(app.classify_error(WebDriverException("element not interactable")))
+        self.assertIsNone(app.classify_error(ValueError("bad value")))
+        self.assertIsNone(app.classify_error(AttributeError("'NoneType' object has no attribute 'get'")))
+        self.assertIsNone(app.classify_error(app.ScraperHalted("checkpoint")))
+
+
+class BackoffDelayTest(unittest.TestCase):
+    def test_doubles_then_caps(self):
+        with mock.patch.object(app.random, 'uniform', side_effect=lambda low, high: high):
+            self.assertEqual(app.backoff_delay(1, base_delay=2, max_delay=60), 2)
+            self.assertEqual(app.backoff_delay(3, base_delay=2, max_delay=60), 8)
+            self.assertEqual(app.backoff_delay(10, base_delay=2, max_delay=60), 60)
+
+    def test_jitter_stays_in_range(self):
+        for attempt in range(1, 12):
+            delay = app.backoff_delay(attempt, base_delay=2, max_delay=60)
+            self.assertGreaterEqual(delay, 0)
+            self.assertLessEqual(delay, 60)
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch.multiple(app.time, monotonic=self.clock.monotonic, sleep=self.clock.sleep)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.breaker = app.CircuitBreaker('www.linkedin.com', window=10, min_samples=5,
+                                          failure_rate=0.5, cooldown=60, max_cooldown=200, max_trips=3)
+
+    def test_stays_closed_below_min_samples(self):
+        for _ in range(4):
+            self.breaker.record_failure()
+        self.assertFalse(self.breaker.is_open())
+
+    def test_opens_when_failure_rate_spikes(self):
+        for _ in range(3):
+            self.breaker.record_success()
+        for _ in range(2):
+            self.breaker.record_failure()
+        self.assertFalse(self.breaker.is_open())
+        self.breaker.record_failure()
+        self.assertTrue(self.breaker.is_open())
+
+    def test_half_open_success_closes_and_resets(self):
+        self.breaker.trip("test")
+        self.breaker.wait_if_open()
+        self.assertEqual(self.clock.sleeps, [60])
+        self.assertTrue(self.breaker.half_open)
+
+        self.breaker.record_success()
+        self.assertFalse(self.breaker.half_open)
+        self.assertFalse(self.breaker.is_open())
+        self.assertEqual(self.breaker.cooldown, 60)
+        self.assertEqual(self.breaker.consecutive_trips, 0)
+
+    def test_half_open_failure_doubles_cooldown_up_to_cap(self):
+        self.breaker.trip("test")
+        self.breaker.wait_if_open()
+        self.breaker.record_failure()
+        self.assertTrue(self.breaker.is_open())
+        self.assertEqual(self.breaker.cooldown, 120)
+
+        self.breaker.wait_if_open()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.cooldown, 200)
+
+    def test_gives_up_after_max_trips(self):
+        for _ in range(2):
+            self.breaker.trip("test")
+            self.breaker.wait_if_open()
+        self.breaker.trip("test")
+        with self.assertRaises(app.ScraperHalted):
+            self.breaker.wait_if_open()
+        self.assertEqual(len(self.clock.sleeps), 2)
+
+
+class FetchWithRetryTest(unittest.TestCase):
+    url = 'https://www.linkedin.com/in/someone'
+
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch.multiple(app.time, monotonic=self.clock.monotonic, sleep=self.clock.sleep)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.scraper = app.LinkedInScraper()
+
+    def test_retries_transient_error_then_succeeds(self):
+        operation = mock.Mock(side_effect=[TimeoutException(), StaleElementReferenceException(), 'ok'])
+        self.assertEqual(self.scraper.fetch_with_retry(self.url, operation, 'test'), 'ok')
+        self.assertEqual(operation.call_count, 3)
+        self.assertEqual(list(self.scraper.get_breaker(self.url).outcomes), [True])
+
+    def test_exhausted_request_counts_once(self):
+        operation = mock.Mock(side_effect=TimeoutException())
+        with self.assertRaises(TimeoutException):
+            self.scraper.fetch_with_retry(self.url, operation, 'test')
+        self.assertEqual(operation.call_count, app.RETRY_MAX_ATTEMPTS)
+        self.assertEqual(list(self.scraper.get_breaker(self.url).outcomes), [False])
+
+    def test_non_transient_error_is_not_retried_or_counted(self):
+        operation = mock.Mock(side_effect=ValueError("bad value"))
+        with self.assertRaises(ValueError):
+            self.scraper.fetch_with_retry(self.url, operation, 'test')
+        self.assertEqual(operation.call_count, 1)
+        self.assertEqual(len(self.scraper.get_breaker(self.url).outcomes), 0)
+
+    def test_throttle_waits_only_for_cooldown(self):
+        operation = mock.Mock(side_effect=[app.ThrottleDetected(), 'ok'])
+        self.assertEqual(self.scraper.fetch_with_retry(self.url, operation, 'test'), 'ok')
+        self.assertEqual(self.clock.sleeps, [app.BREAKER_COOLDOWN])
+
+    def test_throttle_on_last_attempt_trips_breaker(self):
+        side_effect = [TimeoutException()] * (app.RETRY_MAX_ATTEMPTS - 1) + [app.ThrottleDetected()]
+        operation = mock.Mock(side_effect=side_effect)
+        with self.assertRaises(app.ThrottleDetected):
+            self.scraper.fetch_with_retry(self.url, operation, 'test')
+        breaker = self.scraper.get_breaker(self.url)
+        self.assertTrue(breaker.is_open())
+        self.assertEqual(breaker.consecutive_trips, 1)
+        self.assertEqual(list(breaker.outcomes), [False])
+
+    def test_authwall_logs_back_in(self):
+        self.scraper.credentials = ('user', 'secret')
+        operation = mock.Mock(side_effect=[app.AuthWallDetected(), 'ok'])
+        with mock.patch.object(self.scraper, 'login_to_linkedin', return_value=True) as login:
+            self.assertEqual(self.scraper.fetch_with_retry(self.url, operation, 'test'), 'ok')
+        login.assert_called_once_with('user', 'secret')
+
+    def test_failed_driver_restart_halts(self):
+        operation = mock.Mock(side_effect=InvalidSessionIdException())
+        with mock.patch.object(self.scraper, 'setup_driver', side_effect=WebDriverException("no chrome")):
+            with self.assertRaises(app.ScraperHalted):
+                self.scraper.fetch_with_retry(self.url, operation, 'test')
+        self.assertEqual(operation.call_count, 1)
+
+
+
+class ExtractionRetryTest(unittest.TestCase):
+    url = 'https://www.linkedin.com/in/someone'
+
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch.multiple(app.time, monotonic=self.clock.monotonic, sleep=self.clock.sleep)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.scraper = app.LinkedInScraper()
+        self.scraper.driver = mock.MagicMock()
+        self.scraper.driver.current_url = self.url
+        self.scraper.driver.title = 'Someone | LinkedIn'
+        self.scraper.wait = mock.MagicMock()
+
+    def make_stale(self):
+        self.scraper.driver.find_element.side_effect = StaleElementReferenceException()
+        self.scraper.driver.find_elements.side_effect = StaleElementReferenceException()
+        type(self.scraper.driver).page_source = mock.PropertyMock(side_effect=StaleElementReferenceException())
+
+    def test_extract_helpers_propagate_stale_elements(self):
+        self.make_stale()
+        for extract in [self.scraper.extract_name, self.scraper.extract_designation,
+                        self.scraper.extract_company, self.scraper.extract_email]:
+            with self.subTest(extract=extract.__name__):
+                with self.assertRaises(StaleElementReferenceException):
+                    extract()
+
+    def test_scrape_profile_retries_stale_extraction(self):
+        name_element = mock.MagicMock()
+        name_element.text = 'Jane Doe'
+        self.scraper.driver.find_element.side_effect = [StaleElementReferenceException(), name_element]
+        self.scraper.driver.find_elements.return_value = []
+        self.scraper.driver.page_source = ''
+
+        profile_data = self.scraper.scrape_profile(self.url)
+        self.assertEqual(profile_data['name'], 'Jane Doe')
+        self.assertEqual(self.scraper.driver.get.call_count, 2)
+
+    def test_scrape_profile_gives_up_instead_of_saving_blank_fields(self):
+        self.make_stale()
+        self.assertIsNone(self.scraper.scrape_profile(self.url))
+        self.assertEqual(self.scraper.driver.get.call_count, app.RETRY_MAX_ATTEMPTS)
+
+
+if __name__ == '__main__':
+    unittest.main()